@@ -7,77 +7,608 @@ are not accessible.
 """
 
 import argparse
+import atexit
+import base64
 import csv
+import functools
+import json
 import logging
 import os
-import re
+import queue
+import shelve
+import shlex
+import shutil
 import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 from shutil import which
-from urllib.parse import urlparse
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
 import requests
-from bs4 import BeautifulSoup
+import websocket
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
 
 BLUE = "\033[34m"
 GREEN = "\033[32m"
 RED = "\033[31m"
 RESET = "\033[0m"
 WAYBACK_API = "http://archive.org/wayback/available?url={url}"
+# Chrome command-line flags; subsystems not needed for printing are switched off.
+# More flags (e.g. --no-sandbox) can be given in the CHROME_EXTRA_FLAGS variable.
+CHROME_FLAGS = [
+    "--headless=new",
+    "--disable-gpu",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-features=TranslateUI",
+    "--mute-audio",
+    "--hide-scrollbars",
+] + shlex.split(os.environ.get("CHROME_EXTRA_FLAGS", ""))
+# Page.printToPDF options matching `chrome --headless --print-to-pdf`: the
+# header and footer show date, title, source URL and page numbers
+PDF_OPTIONS = {
+    "displayHeaderFooter": True,
+    "printBackground": True,
+    "preferCSSPageSize": True,
+}
+# HEAD answers that are retried as GET, as servers often refuse or mishandle HEAD
+HEAD_FALLBACK_STATUSES = {400, 403, 405, 501}
+PROBE_CACHE_FILE = ".probe_cache"
+# How long a cached probe result is trusted, in seconds
+PROBE_CACHE_TTL_SUCCESS = 30 * 24 * 3600
+PROBE_CACHE_TTL_FAILURE = 7 * 24 * 3600
+# Probes are pure network waits, so they can run wider than the Chrome workers
+PROBE_WORKERS = 32
+# Concurrent Wayback Machine API requests, kept lower to be polite to archive.org
+WAYBACK_WORKERS = 16
+DEFAULT_WORKERS = min(16, (os.cpu_count() or 1) * 2)
 
-# Configure logger once, near the top of your script
+# Configure logger once, near the top of your script.
+# Worker threads only put records on a queue; a background listener thread
+# writes them to the file, so logging never waits on disk I/O.
+_log_file_handler = logging.FileHandler("url_retrieval.log")  # file to write to
+_log_file_handler.setFormatter(
+    logging.Formatter("%(asctime)s %(levelname)s: %(message)s")
+)
+_log_queue = queue.Queue()
+_log_queue_handler = QueueHandler(_log_queue)
+# Records are formatted by the file handler, the queue carries the bare message
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
 logging.basicConfig(
-    filename="url_retrieval.log",  # file to write to
     level=logging.INFO,  # log level
-    format="%(asctime)s %(levelname)s: %(message)s",
+    handlers=[_log_queue_handler],
 )
+# Connection retries are expected for dead links; the log is for failed downloads
+logging.getLogger("urllib3").setLevel(logging.ERROR)
+_log_listener = QueueListener(_log_queue, _log_file_handler)
+_log_listener.start()
+# Flush the remaining records on exit
+atexit.register(_log_listener.stop)
+
+# One session for all HTTP requests, so connections are kept alive and reused
+SESSION = requests.Session()
+
+
+def mount_http_adapter(pool_size=PROBE_WORKERS) -> None:
+    """Mount an adapter with retries on SESSION, keeping *pool_size* connections per host."""
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            # Retry-After may ask for hours and its sleep ignores the request timeout
+            respect_retry_after_header=False,
+            # After the last retry return the 5xx answer instead of raising RetryError
+            raise_on_status=False,
+        ),
+    )
+    SESSION.mount("http://", adapter)
+    SESSION.mount("https://", adapter)
+
+
+mount_http_adapter()
+
+# Worker threads share stdout, so whole lines are printed under a lock
+_print_lock = threading.Lock()
+
+
+def tprint(message: str) -> None:
+    """Print a message as one line, without interleaving with other threads."""
+    with _print_lock:
+        print(message, flush=True)
+
+
+# Characters not allowed in file names, mapped to None to be deleted
+_FILENAME_TRANSLATION = str.maketrans("", "", '\\/*?:"<>|')
+
+# Hosts that failed to connect (DNS failure, refused) and hosts that answered.
+# A host that answered once is never marked dead, as its failure is transient.
+_dead_hosts = set()
+_live_hosts = set()
+_hosts_lock = threading.Lock()
+
+# Chrome navigation errors meaning that the host can't be reached at all
+HOST_DOWN_ERRORS = {
+    "net::ERR_NAME_NOT_RESOLVED",
+    "net::ERR_CONNECTION_REFUSED",
+    "net::ERR_ADDRESS_UNREACHABLE",
+}
+
+# Marks a lookup that raised, as opposed to one that found nothing (None)
+_LOOKUP_FAILED = object()
+
+# On-disk cache of probe results, open only while generate_pdfs runs
+_probe_cache = None
+_probe_cache_lock = threading.Lock()
+
+
+def open_probe_cache(output_dir) -> None:
+    """Open the probe cache stored in *output_dir*, so reruns skip known URLs."""
+    global _probe_cache
+    with _probe_cache_lock:
+        if _probe_cache is None:
+            # Closed by close_probe_cache once all links are processed
+            _probe_cache = shelve.open(os.path.join(output_dir, PROBE_CACHE_FILE))
+
+
+def close_probe_cache() -> None:
+    """Flush and close the probe cache, if open."""
+    global _probe_cache
+    with _probe_cache_lock:
+        if _probe_cache is not None:
+            _probe_cache.close()
+            _probe_cache = None
+
+
+def probe_cached(kind):
+    """
+    Decorate a `func(url, ...)` network lookup to reuse results from the probe cache.
+
+    Truthy results are trusted for PROBE_CACHE_TTL_SUCCESS seconds, falsy ones
+    (dead URLs, missing snapshots) for PROBE_CACHE_TTL_FAILURE seconds.
+    Without an open cache the lookup is always performed.
+
+    Args:
+        kind (str): Key prefix keeping results of different lookups apart.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(url, *args, **kwargs):
+            key = f"{kind}:{url}"
+            with _probe_cache_lock:
+                entry = _probe_cache.get(key) if _probe_cache is not None else None
+            if entry is not None:
+                ttl = (
+                    PROBE_CACHE_TTL_SUCCESS
+                    if entry["value"]
+                    else PROBE_CACHE_TTL_FAILURE
+                )
+                if time.time() - entry["ts"] < ttl:
+                    return entry["value"]
+            value = func(url, *args, **kwargs)
+            with _probe_cache_lock:
+                if _probe_cache is not None:
+                    _probe_cache[key] = {"value": value, "ts": time.time()}
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def _host(url: str) -> str:
+    """Return the lowercased network location of *url*."""
+    return urlparse(url).netloc.lower()
+
+
+def mark_host_live(url: str) -> None:
+    """Remember that the host of *url* answered."""
+    with _hosts_lock:
+        _live_hosts.add(_host(url))
+        _dead_hosts.discard(_host(url))
+
+
+def mark_host_dead(url: str) -> None:
+    """Remember that the host of *url* can't be connected to, unless it answered before."""
+    with _hosts_lock:
+        if _host(url) not in _live_hosts:
+            _dead_hosts.add(_host(url))
+
+
+def is_host_dead(url: str) -> bool:
+    """Return True if connecting to the host of *url* already failed in this run."""
+    with _hosts_lock:
+        return _host(url) in _dead_hosts
 
 
 def sanitize_filename(name) -> str:
     """Remove invalid filename characters."""
-    return re.sub(r'[\\/*?:"<>|]', "", name).strip()
+    return name.translate(_FILENAME_TRANSLATION).strip()
+
+
+class ChromeRenderer:
+    """
+    A long-lived headless Chrome that prints pages to PDF over the DevTools Protocol.
+
+    Starting Chrome takes seconds, while printing a page often takes less,
+    so one browser is launched and every page is opened in a new tab of it.
+    Each renderer has its own temporary profile, so several can run side
+    by side, and each page its own incognito-like browser context.
+    A renderer is not thread-safe; use one per thread.
+
+    Usage:
+        with ChromeRenderer("chrome") as renderer:
+            renderer.print_to_pdf("https://example.com", "example.pdf")
+    """
+
+    def __init__(self, chrome_path: str = "chrome", startup_timeout: int = 20):
+        """
+        Args:
+            chrome_path (str): Path to Chrome or Chromium executable.
+            startup_timeout (int): Seconds to wait for Chrome to open its DevTools port.
+        """
+        self.chrome_path = chrome_path
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.profile_dir = None
+        self.ws = None
+        self._stderr = None
+        self._message_id = 0
+        self._events = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def alive(self) -> bool:
+        """True while the browser process runs and the DevTools connection is open."""
+        return (
+            self.process is not None
+            and self.process.poll() is None
+            and self.ws is not None
+            and self.ws.connected
+        )
+
+    def start(self) -> None:
+        """
+        Launch Chrome and connect to its DevTools websocket.
+
+        Raises:
+            OSError: Chrome could not be started.
+            RuntimeError: Chrome did not open its DevTools port in time.
+        """
+        self.profile_dir = tempfile.mkdtemp(prefix="chrome-prof-")
+        # Chrome's own messages are kept for errors, see _stderr_tail; closed in close()
+        self._stderr = open(os.path.join(self.profile_dir, "chrome_stderr.log"), "wb")
+        self.process = subprocess.Popen(
+            [
+                self.chrome_path,
+                *CHROME_FLAGS,
+                "--remote-debugging-port=0",
+                f"--user-data-dir={self.profile_dir}",
+                "about:blank",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=self._stderr,
+        )
+        # With port 0 Chrome picks a free port and writes it, with the browser
+        # websocket path, into DevToolsActivePort in the profile directory
+        port_file = os.path.join(self.profile_dir, "DevToolsActivePort")
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            if self.process.poll() is not None:
+                message = f"Chrome exited with code {self.process.returncode}"
+                message += self._stderr_tail()
+                self.close()
+                raise RuntimeError(message)
+            try:
+                with open(port_file, encoding="utf-8") as f:
+                    lines = f.read().split()
+                if len(lines) >= 2:
+                    break
+            except OSError:
+                pass
+            if time.monotonic() > deadline:
+                message = "Chrome did not open the DevTools port in time"
+                message += self._stderr_tail()
+                self.close()
+                raise RuntimeError(message)
+            time.sleep(0.1)
+        self.ws = websocket.create_connection(
+            f"ws://127.0.0.1:{lines[0]}{lines[1]}",
+            timeout=self.startup_timeout,
+            suppress_origin=True,
+        )
+
+    def close(self) -> None:
+        """Close the browser and remove its temporary profile."""
+        if self.ws is not None:
+            try:
+                self._send("Browser.close", timeout=5)
+            except (RuntimeError, websocket.WebSocketException, OSError):
+                pass
+            self.ws.close()
+            self.ws = None
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self._stderr is not None:
+            self._stderr.close()
+            self._stderr = None
+        if self.profile_dir is not None:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+    def _stderr_tail(self, lines: int = 5) -> str:
+        """Return the last *lines* Chrome wrote to stderr, ready to append to a message."""
+        if self.profile_dir is None:
+            return ""
+        try:
+            with open(
+                os.path.join(self.profile_dir, "chrome_stderr.log"),
+                encoding="utf-8",
+                errors="replace",
+            ) as f:
+                tail = [line.rstrip() for line in f if line.strip()][-lines:]
+        except OSError:
+            return ""
+        return ": " + " | ".join(tail) if tail else ""
+
+    def _recv(self, deadline: float) -> dict:
+        """Receive the next DevTools message, waiting until *deadline* at most."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise websocket.WebSocketTimeoutException("DevTools deadline passed")
+        self.ws.settimeout(remaining)
+        return json.loads(self.ws.recv())
+
+    def _send(self, method, params=None, session_id=None, timeout=25) -> dict:
+        """
+        Send a DevTools command and wait for its result.
+
+        Events received meanwhile are kept for `_wait_event`.
+
+        Raises:
+            RuntimeError: DevTools answered with an error.
+            websocket.WebSocketTimeoutException: No answer within *timeout* seconds.
+        """
+        self._message_id += 1
+        message = {"id": self._message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        self.ws.send(json.dumps(message))
+        deadline = time.monotonic() + timeout
+        while True:
+            reply = self._recv(deadline)
+            if reply.get("id") == self._message_id:
+                if "error" in reply:
+                    raise RuntimeError(f"{method}: {reply['error'].get('message')}")
+                return reply.get("result", {})
+            if "method" in reply:
+                self._events.append(reply)
+
+    def _wait_event(self, method, session_id, timeout) -> dict:
+        """Wait for the DevTools event *method* of the given session."""
+        deadline = time.monotonic() + timeout
+        while True:
+            for event in self._events:
+                if event["method"] == method and event.get("sessionId") == session_id:
+                    self._events.remove(event)
+                    return event.get("params", {})
+            event = self._recv(deadline)
+            if "method" in event:
+                self._events.append(event)
+
+    def print_to_pdf(
+        self,
+        url: str,
+        output_path: str,
+        timeout: int = 25,
+        accept_http_errors: bool = False,
+    ) -> None:
+        """
+        Open *url* in a new tab, wait for it to load and save it as a PDF.
+
+        Args:
+            url (str): URL of the web page to save.
+            output_path (str): Full file path to save the PDF.
+            timeout (int): Seconds allowed for loading and printing the page.
+            accept_http_errors (bool): Print pages answered with HTTP 4xx/5xx too.
+
+        Raises:
+            RuntimeError: The page could not be loaded (or answered with an
+                HTTP error, unless accepted) or printed.
+            websocket.WebSocketTimeoutException: The page took longer than *timeout*.
+        """
+        deadline = time.monotonic() + timeout
+        # Each page gets its own in-memory browser context, so no cookies,
+        # cache or storage are shared between pages
+        context_id = self._send("Target.createBrowserContext")["browserContextId"]
+        try:
+            target_id = self._send(
+                "Target.createTarget",
+                {"url": "about:blank", "browserContextId": context_id},
+            )["targetId"]
+            session_id = self._send(
+                "Target.attachToTarget", {"targetId": target_id, "flatten": True}
+            )["sessionId"]
+            self._send("Page.enable", session_id=session_id)
+            navigation = self._send(
+                "Page.navigate",
+                {"url": url},
+                session_id=session_id,
+                timeout=max(0, deadline - time.monotonic()),
+            )
+            if navigation.get("errorText"):
+                raise RuntimeError(navigation["errorText"])
+            self._wait_event(
+                "Page.loadEventFired", session_id, deadline - time.monotonic()
+            )
+            if not accept_http_errors:
+                # responseStatus is 0 where the browser doesn't report it
+                status = (
+                    self._send(
+                        "Runtime.evaluate",
+                        {
+                            "expression": "performance.getEntriesByType"
+                            "('navigation')[0].responseStatus",
+                            "returnByValue": True,
+                        },
+                        session_id=session_id,
+                        timeout=max(0, deadline - time.monotonic()),
+                    )
+                    .get("result", {})
+                    .get("value")
+                )
+                if isinstance(status, int) and status >= 400:
+                    raise RuntimeError(f"HTTP status {status}")
+            pdf = self._send(
+                "Page.printToPDF",
+                PDF_OPTIONS,
+                session_id=session_id,
+                timeout=max(0, deadline - time.monotonic()),
+            )
+            # Write next to the target and rename, so an interrupted run never
+            # leaves a partial PDF that would be skipped as already saved
+            staging_path = os.path.join(
+                os.path.dirname(output_path), f".{uuid.uuid4().hex}.pdf.part"
+            )
+            try:
+                with open(staging_path, "wb") as f:
+                    f.write(base64.b64decode(pdf["data"]))
+                os.replace(staging_path, output_path)
+            finally:
+                if os.path.exists(staging_path):
+                    os.unlink(staging_path)
+        finally:
+            # Tabs of a timed-out page may keep sending events; drop them
+            self._events = []
+            if self.alive:
+                try:
+                    # Closes the page's tab as well
+                    self._send(
+                        "Target.disposeBrowserContext",
+                        {"browserContextId": context_id},
+                        timeout=5,
+                    )
+                except (RuntimeError, websocket.WebSocketException):
+                    pass
+
+
+# One ChromeRenderer per worker thread, all closed by close_renderers
+_renderers = threading.local()
+_all_renderers = []
+_all_renderers_lock = threading.Lock()
+
+
+def _thread_renderer(chrome_path: str) -> ChromeRenderer:
+    """Return the running renderer of the current thread, starting one if needed."""
+    renderer = getattr(_renderers, "renderer", None)
+    if renderer is not None and renderer.alive:
+        return renderer
+    if renderer is not None:
+        renderer.close()
+    renderer = ChromeRenderer(chrome_path)
+    _renderers.renderer = renderer
+    with _all_renderers_lock:
+        _all_renderers.append(renderer)
+    renderer.start()
+    return renderer
+
+
+def close_renderers() -> None:
+    """Close the Chrome instances started by `save_pdf_with_chrome`."""
+    with _all_renderers_lock:
+        renderers = list(_all_renderers)
+        _all_renderers.clear()
+    for renderer in renderers:
+        renderer.close()
 
 
 def save_pdf_with_chrome(
-    url: str, output_path: str, chrome_path: str = "chrome", timeout: int = 25
+    url: str,
+    output_path: str,
+    chrome_path: str = "chrome",
+    timeout: int = 25,
+    accept_http_errors: bool = False,
 ) -> bool:
     """
     Save the web page at the given URL as a PDF file using headless Chrome.
 
+    The page is printed by a long-lived Chrome of the calling thread,
+    see `ChromeRenderer`; call `close_renderers` once done.
+
     Args:
         url (str): URL of the web page to save.
         output_path (str): Full file path to save the PDF.
         chrome_path (str): Path to Chrome or Chromium executable.
-        timeout (int): The Chrome process is aborted if it runs longer than *timeout* seconds.
+        timeout (int): Printing is aborted if it takes longer than *timeout* seconds.
+        accept_http_errors (bool): Save pages answered with HTTP 4xx/5xx too.
 
     Returns:
-        bool: True if PDF was created successfully, False on any failure (timeout or non-zero exit).
+        bool: True if PDF was created successfully, False on any failure (timeout, load or HTTP error).
     """
-    # Resolve chrome executable if only a bare name is given
-    chrome_exe = which(chrome_path) or chrome_path
-
     absolute_path = os.path.abspath(output_path)
-    # Build the command as a list to avoid shell-quoting problems
-    cmd = [
-        chrome_exe,
-        "--headless",
-        "--disable-gpu",
-        f"--print-to-pdf={absolute_path}",
-        url,
-    ]
     try:
-        subprocess.run(cmd, check=True, timeout=timeout)
-        print(f"{GREEN}Saved PDF: {absolute_path}{RESET}")
+        renderer = _thread_renderer(chrome_path)
+    except (OSError, RuntimeError, websocket.WebSocketException) as e:
+        tprint(f"{RED}Error starting Chrome for {url}: {e}{RESET}")
+        return False
+    try:
+        renderer.print_to_pdf(
+            url, absolute_path, timeout=timeout, accept_http_errors=accept_http_errors
+        )
+        mark_host_live(url)
+        tprint(f"{GREEN}Saved PDF: {absolute_path}{RESET}")
         return True
 
-    except subprocess.TimeoutExpired as e:
-        print(f"{RED}Timeout after {e.timeout}s generating PDF for {url}{RESET}")
+    except websocket.WebSocketTimeoutException:
+        tprint(f"{RED}Timeout after {timeout}s generating PDF for {url}{RESET}")
+        # The connection may be left mid-message; the next page gets a fresh Chrome
+        renderer.close()
         return False
 
-    except subprocess.CalledProcessError as e:
-        print(f"{RED}Error generating PDF for {url}: {e}{RESET}")
+    except (RuntimeError, websocket.WebSocketException, OSError) as e:
+        if str(e) in HOST_DOWN_ERRORS:
+            mark_host_dead(url)
+        tprint(f"{RED}Error generating PDF for {url}: {e}{RESET}")
         return False
 
 
+@probe_cached("wayback")
+def _lookup_wayback_url(url):
+    """Ask the Wayback Machine API for the closest snapshot; errors are raised, not cached."""
+    with SESSION.get(WAYBACK_API.format(url=url), timeout=10) as r:
+        r.raise_for_status()
+        data = r.json()
+    snapshots = data.get("archived_snapshots", {})
+    if "closest" in snapshots:
+        return snapshots["closest"]["url"]
+    return None
+
+
 def fetch_wayback_url(url):
     """
     Query archive.org Wayback Machine API for closest archived snapshot URL.
@@ -89,17 +620,42 @@ def fetch_wayback_url(url):
         str or None: Archive URL if available, else None.
     """
     try:
-        r = requests.get(WAYBACK_API.format(url=url), timeout=10)
-        r.raise_for_status()
-        data = r.json()
-        snapshots = data.get("archived_snapshots", {})
-        if "closest" in snapshots:
-            return snapshots["closest"]["url"]
+        return _lookup_wayback_url(url)
     except requests.RequestException as e:
-        print(f"{RED}Wayback API error for {url}: {e}{RESET}")
+        tprint(f"{RED}Wayback API error for {url}: {e}{RESET}")
     return None
 
 
+def fetch_wayback_urls_bulk(urls, workers=WAYBACK_WORKERS) -> dict:
+    """
+    Query archive.org Wayback Machine API for many URLs concurrently.
+
+    Args:
+        urls (list): Original URLs to check archive for; duplicates are looked up once.
+        workers (int): Number of concurrent API requests.
+
+    Returns:
+        dict: URL -> archive URL or None. URLs whose lookup failed are left out,
+        so that `fetch_wayback_url` can retry them later.
+    """
+
+    def lookup(url):
+        try:
+            return url, _lookup_wayback_url(url)
+        except requests.RequestException:
+            return url, _LOOKUP_FAILED
+
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return {
+            url: archive_url
+            for url, archive_url in executor.map(lookup, unique_urls)
+            if archive_url is not _LOOKUP_FAILED
+        }
+
+
 def html_parse_pocket_export(file_path):
     """
     Parse Pocket export HTML and return list of dicts with keys: url, title, tags.
@@ -111,7 +667,8 @@ def html_parse_pocket_export(file_path):
         list of dict: Each dict contains 'url', 'title', 'tags' (list).
     """
     with open(file_path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f, "html.parser")
+        # C-based lxml parser; only <a> elements are kept in the tree
+        soup = BeautifulSoup(f, "lxml", parse_only=SoupStrainer("a", href=True))
     links = []
     for a in soup.find_all("a", href=True):
         url = a["href"]
@@ -138,16 +695,23 @@ def parse_pocket_export(file_path):
     """
     links = []
     with open(file_path, newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
+        reader = csv.reader(csvfile)
+        # Resolve column positions once instead of building a dict per row
+        columns = {name: i for i, name in enumerate(next(reader, []))}
+
+        def indices(*names):
+            return [columns[name] for name in names if name in columns]
+
+        url_columns = indices("resolved_url", "given_url", "url")
+        title_columns = indices("resolved_title", "given_title", "title")
+        tags_columns = indices("tags")
         for row in reader:
-            url = row.get("resolved_url") or row.get("given_url") or row.get("url")
-            title = (
-                row.get("resolved_title")
-                or row.get("given_title")
-                or row.get("title")
-                or "untitled"
+            width = len(row)
+            url = next((row[i] for i in url_columns if i < width and row[i]), None)
+            title = next(
+                (row[i] for i in title_columns if i < width and row[i]), "untitled"
             )
-            tags_str = row.get("tags") or ""
+            tags_str = next((row[i] for i in tags_columns if i < width), "")
             tags = (
                 [t.strip() for t in tags_str.replace("|", ",").split(",")]
                 if tags_str
@@ -161,9 +725,55 @@ def parse_pocket_export(file_path):
     return links
 
 
+def _probe_status(method, url, timeout, headers=None) -> int:
+    """Send a single probe request and return its status code without the body."""
+    with SESSION.request(
+        method,
+        url,
+        headers=headers,
+        allow_redirects=True,
+        stream=True,
+        timeout=timeout,
+    ) as response:
+        return response.status_code
+
+
+@probe_cached("accessible")
+def _check_url_accessible(url, timeout):
+    """Probe *url* once; only real HTTP answers are returned (and cached), errors are raised."""
+    try:
+        status = _probe_status("HEAD", url, timeout)
+    except requests.Timeout:
+        raise  # a slow server won't answer a GET faster
+    except requests.ConnectionError as e:
+        # An unreachable host (DNS failure, refused) won't answer a GET either;
+        # only a connection dropped in reply to HEAD is worth a GET
+        reason = e.args[0] if e.args else None
+        if isinstance(getattr(reason, "reason", reason), NewConnectionError):
+            raise
+        status = None
+    except requests.RequestException:
+        status = None
+    if status is None or status in HEAD_FALLBACK_STATUSES:
+        status = _probe_status("GET", url, timeout, headers={"Range": "bytes=0-0"})
+        if status == 416:  # Range Not Satisfiable
+            status = _probe_status("GET", url, timeout)
+    mark_host_live(url)
+    tprint(f"Get response status code: {status}")
+    # Consider accessible if status code is 200–399
+    return 200 <= status < 400
+
+
 def is_url_accessible(url, timeout=5) -> bool:
     """
-    Check if a URL is accessible by sending a GET request.
+    Check if a URL is accessible, transferring as little of the page as possible.
+
+    A HEAD request is tried first. Some webservers don't answer right to HEAD,
+    so on 400/403/405/501 (or a failed HEAD) a GET of the first byte only is
+    sent, and a plain GET is the last resort if the range is refused.
+    Timeouts and connection errors count as not accessible for this call
+    only; they are not kept in the probe cache. URLs on a host found
+    unreachable earlier in this run are not contacted at all.
 
     Args:
         url (str): URL to check.
@@ -172,78 +782,336 @@ def is_url_accessible(url, timeout=5) -> bool:
     Returns:
         bool: True if status code is 200–399, False otherwise.
     """
+    # Checked outside the cache, as a dead host is only known for this run
+    if is_host_dead(url):
+        return False
     try:
-        # Some webservers don't answer right to requests.head
-        # response = requests.head(url, allow_redirects=True, timeout=timeout)
-        response = requests.get(url, stream=True, timeout=timeout)
-        print(f"Get response status code: {response.status_code}")
-        # Consider accessible if status code is 200–399
-        return 200 <= response.status_code < 400
+        return _check_url_accessible(url, timeout)
+    except requests.ConnectionError as e:
+        if not isinstance(e, requests.Timeout):
+            mark_host_dead(url)
+        return False
     except requests.RequestException:
         return False
 
 
-def generate_pdfs(links, output_dir, chrome_path):
+def _is_case_insensitive(directory) -> bool:
+    """Check whether the file system holding *directory* ignores the case of file names."""
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=".casecheck") as f:
+        return os.path.exists(os.path.join(directory, os.path.basename(f.name).upper()))
+
+
+class PdfIndex:
+    """
+    Paths of the PDFs in an output directory, listed with one directory scan.
+
+    Lookups only consult the index, never the file system. Paths are compared
+    normalized (`out/./x.pdf`, `OUT\\X.pdf` on Windows) and, on a case-insensitive
+    file system (macOS, Windows), casefolded, so that `News/x.pdf` finds a file
+    that was saved as `news/x.pdf`. Partial `*.pdf.part` files met by the scan
+    are removed.
     """
-    Generate PDFs from list of links organized by tags using Chrome headless.
+
+    def __init__(self, output_dir):
+        self.fold_case = _is_case_insensitive(output_dir)
+        self._keys = set()
+        for root, _, files in os.walk(output_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith(".pdf"):
+                    self._keys.add(self._key(path))
+                elif name.endswith(".pdf.part"):
+                    # Left behind by a run killed while writing a PDF
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+    def _key(self, path: str) -> str:
+        key = os.path.normcase(os.path.normpath(path))
+        return key.casefold() if self.fold_case else key
+
+    def __contains__(self, path) -> bool:
+        return self._key(path) in self._keys
+
+    def add(self, path):
+        """Record the PDF saved at *path*."""
+        self._keys.add(self._key(path))
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so that trivially different spellings of a page compare equal.
+
+    Scheme and host are lowercased, default ports and a trailing `/` removed,
+    and tracking parameters (`utm_*`, `fbclid`) dropped from the query.
+
+    Args:
+        url (str): URL to normalize.
+
+    Returns:
+        str: Canonical form of the URL, meant for comparison only.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if (scheme, netloc.rpartition(":")[2]) in (("http", "80"), ("https", "443")):
+        netloc = netloc.rpartition(":")[0]
+    query = urlencode(
+        [
+            (key, value)
+            for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+            if not key.startswith("utm_") and key != "fbclid"
+        ]
+    )
+    return urlunparse(
+        (scheme, netloc, parsed.path.rstrip("/"), parsed.params, query, parsed.fragment)
+    )
+
+
+def deduplicate_links(links) -> list:
+    """
+    Number links from 1 and drop those whose URL repeats an earlier one.
+
+    The first occurrence wins, keeping its title, tags and index, so PDF
+    names stay the same as without deduplication.
 
     Args:
         links (list): List of dicts with 'url', 'title', 'tags'.
+
+    Returns:
+        list of tuple: (index, link) pairs of the unique links, in input order.
+    """
+    seen = set()
+    unique = []
+    for idx, link in enumerate(links, 1):
+        key = canonicalize_url(link["url"])
+        if key not in seen:
+            seen.add(key)
+            unique.append((idx, link))
+    return unique
+
+
+@functools.lru_cache(maxsize=None)
+def _domain(url: str) -> str:
+    """Return the host of *url* without `www.`, as used in PDF file names."""
+    return urlparse(url).netloc.replace("www.", "")
+
+
+def _tag_folder(link, output_dir) -> str:
+    """Return the folder of a link's PDF, named after its first tag."""
+    tags = link["tags"] or ["Unlabeled"]
+    return os.path.join(output_dir, sanitize_filename(tags[0]))
+
+
+def _pdf_path(idx, link, output_dir) -> str:
+    """
+    Build the PDF file path of a link: <tag folder>/<title>_<domain>_<idx>.pdf.
+
+    Args:
+        idx (int): 1-based position of the link, used in the PDF file name.
+        link (dict): Dict with 'url', 'title', 'tags'.
         output_dir (str): Base directory to save PDFs.
-        chrome_path (str): Path to Chrome executable.
+
+    Returns:
+        str: Path of the PDF inside *output_dir*.
     """
-    os.makedirs(output_dir, exist_ok=True)
+    title = sanitize_filename(link["title"]) or f"page_{idx}"
+    filename = f"{title}_{_domain(link['url'])}_{idx}.pdf"
+    return os.path.join(_tag_folder(link, output_dir), filename)
 
-    for idx, link in enumerate(links, 1):
-        url = link["url"]
-        print(f"{BLUE}Processing ({idx}/{len(links)}): {url}{RESET}")
-        title = sanitize_filename(link["title"]) or f"page_{idx}"
-        tags = link["tags"] or ["Unlabeled"]
 
-        folder = os.path.join(output_dir, sanitize_filename(tags[0]))
-        os.makedirs(folder, exist_ok=True)
+def prefetch_accessibility(urls, workers=PROBE_WORKERS) -> dict:
+    """
+    Check accessibility of many URLs concurrently, ahead of rendering them.
+
+    Args:
+        urls (list): URLs to check; duplicates are probed once.
+        workers (int): Number of concurrent probes.
+
+    Returns:
+        dict: URL -> bool, as returned by `is_url_accessible`.
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = executor.map(lambda u: is_url_accessible(u, 10), unique_urls)
+        return dict(zip(unique_urls, results))
+
+
+def _process_link(
+    idx,
+    link,
+    total,
+    output_dir,
+    chrome_path,
+    probes=None,
+    snapshots=None,
+    existing=None,
+) -> bool:
+    """
+    Generate the PDF for a single link, falling back to archive.org if needed.
+
+    Args:
+        idx (int): 1-based position of the link, used in the PDF file name.
+        link (dict): Dict with 'url', 'title', 'tags'.
+        total (int): Number of links being processed, for progress output.
+        output_dir (str): Base directory to save PDFs; the tag folder must exist.
+        chrome_path (str): Path to Chrome executable.
+        probes (dict or None): Prefetched results of `is_url_accessible`;
+            URLs missing from it are probed here.
+        snapshots (dict or None): Prefetched results of `fetch_wayback_url`;
+            URLs missing from it are looked up here.
+        existing (PdfIndex or None): PDFs already in *output_dir*; the new
+            PDF is added to it. None means the file system is checked instead.
 
-        domain = urlparse(url).netloc.replace("www.", "")
-        filename = f"{title}_{domain}_{idx}.pdf"
-        output_path = os.path.join(folder, filename)
-        if os.path.exists(output_path):
-            print(f"Skipping existing PDF: {output_path}")
-            continue
+    Returns:
+        bool: True if the PDF exists or was created, False otherwise.
+    """
+    url = link["url"]
+    tprint(f"{BLUE}Processing ({idx}/{total}): {url}{RESET}")
+    output_path = _pdf_path(idx, link, output_dir)
+    if existing is None:
+        saved = os.path.exists(output_path)
+    else:
+        saved = output_path in existing
+    if saved:
+        tprint(f"Skipping existing PDF: {output_path}")
+        return True
+
+    accessible = (probes or {}).get(url)
+    if accessible is None:
+        accessible = is_url_accessible(url, 10)
+    if accessible and is_host_dead(url):
+        # An earlier link showed the host is unreachable; go straight to Wayback
+        success = False
+        tprint(f"{RED}Host not reachable: {url}{RESET}")
+    elif accessible:
+        success = save_pdf_with_chrome(url, output_path, chrome_path=chrome_path)
+    else:
+        success = False
+        tprint(f"{RED}URL not accessible: {url}{RESET}")
 
-        if is_url_accessible(url, 10):
-            success = save_pdf_with_chrome(url, output_path, chrome_path=chrome_path)
+    if success:
+        if existing is not None:
+            existing.add(output_path)
+        return True
+
+    tprint(f"Trying Wayback Machine fallback for {url}")
+    if snapshots and url in snapshots:
+        archive_url = snapshots[url]
+    else:
+        archive_url = fetch_wayback_url(url)
+    if archive_url:
+        tprint(f"{GREEN}Found archive.org snapshot: {archive_url}{RESET}")
+        success2 = save_pdf_with_chrome(
+            archive_url, output_path, chrome_path=chrome_path
+        )
+        if not success2:
+            logging.warning("Failed downloading archive.org snapshot: %s", archive_url)
+    elif is_host_dead(url):
+        tprint(f"{RED}No archive.org snapshot found for {url}{RESET}")
+        success2 = False
+        logging.warning("Failed downloading, host not reachable: %s", url)
+    else:
+        tprint(f"{RED}No archive.org snapshot found for {url}{RESET}")
+        tprint(
+            "Trying directly one more time."
+        )  # e.g. for 404 response (could be made optional)
+        success2 = save_pdf_with_chrome(
+            url, output_path, chrome_path=chrome_path, accept_http_errors=True
+        )
+        if success2:
+            logging.warning(
+                'Double check downloading snapshot directly: %s : "%s"',
+                url,
+                output_path,
+            )
         else:
-            success = False
-            print(f"{RED}URL not accessible: {url}{RESET}")
-
-        if not success:
-            print(f"Trying Wayback Machine fallback for {url}")
-            archive_url = fetch_wayback_url(url)
-            if archive_url:
-                print(f"{GREEN}Found archive.org snapshot: {archive_url}{RESET}")
-                success2 = save_pdf_with_chrome(
-                    archive_url, output_path, chrome_path=chrome_path
-                )
-                if not success2:
-                    logging.warning(
-                        "Failed downloading archive.org snapshot: %s", archive_url
-                    )
-            else:
-                print(f"{RED}No archive.org snapshot found for {url}{RESET}")
-                print(
-                    "Trying directly one more time."
-                )  # e.g. for 404 response (could be made optional)
-                success2 = save_pdf_with_chrome(
-                    url, output_path, chrome_path=chrome_path
+            logging.warning("Failed downloading snapshot directly: %s", url)
+    if success2 and existing is not None:
+        existing.add(output_path)
+    return success2
+
+
+def generate_pdfs(
+    links,
+    output_dir,
+    chrome_path,
+    workers=DEFAULT_WORKERS,
+    probe=False,
+    probe_workers=PROBE_WORKERS,
+):
+    """
+    Generate PDFs from list of links organized by tags using Chrome headless.
+
+    Links repeating an earlier URL are skipped, see `deduplicate_links`.
+    Links are processed concurrently, as the work is dominated by network
+    waits and Chrome start-up rather than by Python itself. With *probe*,
+    URLs without a PDF yet are checked for accessibility in one concurrent
+    pass first, and archive.org snapshots of the inaccessible ones are looked
+    up in another. Otherwise Chrome's own load errors lead to the fallback.
+
+    Args:
+        links (list): List of dicts with 'url', 'title', 'tags'.
+        output_dir (str): Base directory to save PDFs.
+        chrome_path (str): Path to Chrome executable.
+        workers (int): Number of links processed in parallel.
+        probe (bool): Check URL accessibility before rendering.
+        probe_workers (int): Number of concurrent accessibility probes.
+
+    Returns:
+        list of bool: Result of `_process_link` per unique link, in input order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    open_probe_cache(output_dir)
+    if probe and probe_workers > PROBE_WORKERS:
+        # More probes than pooled connections would open and drop extra ones
+        mount_http_adapter(probe_workers)
+
+    total = len(links)
+    numbered_links = deduplicate_links(links)
+    existing = PdfIndex(output_dir)
+    if len(numbered_links) < total:
+        tprint(f"Skipping {total - len(numbered_links)} duplicate links.")
+    pending_links = [
+        (idx, link)
+        for idx, link in numbered_links
+        if _pdf_path(idx, link, output_dir) not in existing
+    ]
+    # Each tag folder is created once here rather than once per link
+    for folder in {_tag_folder(link, output_dir) for _, link in pending_links}:
+        os.makedirs(folder, exist_ok=True)
+    try:
+        urls = [link["url"] for _, link in pending_links]
+        probes = (
+            prefetch_accessibility(urls, workers=probe_workers)
+            if probe
+            else dict.fromkeys(urls, True)
+        )
+        snapshots = fetch_wayback_urls_bulk(
+            [url for url, accessible in probes.items() if not accessible]
+        )
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            return list(
+                executor.map(
+                    lambda item: _process_link(
+                        item[0],
+                        item[1],
+                        total,
+                        output_dir,
+                        chrome_path,
+                        probes=probes,
+                        snapshots=snapshots,
+                        existing=existing,
+                    ),
+                    numbered_links,
                 )
-                if success2:
-                    logging.warning(
-                        'Double check downloading snapshot directly: %s : "%s"',
-                        url,
-                        output_path,
-                    )
-                else:
-                    logging.warning("Failed downloading snapshot directly: %s", url)
+            )
+    finally:
+        close_renderers()
+        close_probe_cache()
 
 
 def main():
@@ -260,13 +1128,42 @@ def main():
         default="chrome",
         help='Path to Chrome/Chromium executable (default: "chrome")',
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of links processed in parallel (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--probe",
+        action="store_true",
+        help="Check URL accessibility before rendering instead of relying on Chrome",
+    )
+    parser.add_argument(
+        "--probe-workers",
+        type=int,
+        default=PROBE_WORKERS,
+        help=f"Number of concurrent URL accessibility checks with --probe (default: {PROBE_WORKERS})",
+    )
     args = parser.parse_args()
 
+    # Resolve chrome executable once if only a bare name is given
+    chrome_exe = which(args.chrome) or args.chrome
+    if not os.path.isfile(chrome_exe):
+        sys.exit(f"{RED}Chrome not found: {args.chrome}{RESET}")
+
     print(f"Parsing export file: {args.input}")
     links = parse_pocket_export(args.input)
     print(f"Found {len(links)} links.")
 
-    generate_pdfs(links, args.output, args.chrome)
+    generate_pdfs(
+        links,
+        args.output,
+        chrome_exe,
+        workers=args.workers,
+        probe=args.probe,
+        probe_workers=args.probe_workers,
+    )
 
 
 if __name__ == "__main__":